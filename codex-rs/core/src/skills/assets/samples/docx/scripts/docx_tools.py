@@ -4,50 +4,232 @@ Word document utilities using python-docx.
 """
 
 import argparse
+import json
+import mmap
+import os
+import re
 import sys
+import zipfile
 from pathlib import Path
 
 try:
     from docx import Document
     from docx.shared import Inches, Pt
     from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.opc.coreprops import CoreProperties
+    from docx.oxml import parse_xml
+    from lxml import etree
 except ImportError:
     print("Error: python-docx not installed. Run: pip install python-docx", file=sys.stderr)
     sys.exit(1)
 
 
+class _MappedFile(mmap.mmap):
+    """Read-only mmap that also answers zipfile's seekable() probe."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+def _mmap_open(path: str):
+    """Map a file read-only so the parser reads it from the page cache without copying."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return path  # Empty files can't be mapped; let the parser report the error
+        return _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# WordprocessingML tags in Clark notation, resolved once instead of per element
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_BODY = _W + 'body'
+_W_BR = _W + 'br'
+_W_CR = _W + 'cr'
+_W_NO_BREAK_HYPHEN = _W + 'noBreakHyphen'
+_W_P = _W + 'p'
+_W_PPR = _W + 'pPr'
+_W_PTAB = _W + 'ptab'
+_W_SECTPR = _W + 'sectPr'
+_W_T = _W + 't'
+_W_TAB = _W + 'tab'
+_W_TBL = _W + 'tbl'
+_W_TC = _W + 'tc'
+_W_TCPR = _W + 'tcPr'
+_W_TR = _W + 'tr'
+_W_TRPR = _W + 'trPr'
+_W_TYPE = _W + 'type'
+_W_VAL = _W + 'val'
+_W_GRIDBEFORE = _W + 'gridBefore'
+_W_GRIDSPAN = _W + 'gridSpan'
+_W_VMERGE = _W + 'vMerge'
+_W_PPR_SECTPR = f'{_W_PPR}/{_W_SECTPR}'
+_W_TCPR_GRIDSPAN = f'{_W_TCPR}/{_W_GRIDSPAN}'
+_W_TCPR_VMERGE = f'{_W_TCPR}/{_W_VMERGE}'
+_W_TRPR_GRIDBEFORE = f'{_W_TRPR}/{_W_GRIDBEFORE}'
+
+# Run content of a paragraph as python-docx's Paragraph.text sees it: direct and
+# hyperlink runs only, never text boxes or other content nested in drawings
+_XP_RUN_CONTENT = etree.XPath('./w:r/* | ./w:hyperlink/w:r/*', namespaces={'w': _W[1:-1]})
+
+# Text equivalents of non-<w:t> run content, as python-docx renders them
+_RUN_CONTENT_TEXT = {_W_TAB: '\t', _W_PTAB: '\t', _W_CR: '\n', _W_NO_BREAK_HYPHEN: '-'}
+
+
+def _paragraph_text(p) -> str:
+    """Return the text of a <w:p> element, translating tabs and breaks."""
+    parts = []
+    for elem in _XP_RUN_CONTENT(p):
+        if elem.tag == _W_T:
+            parts.append(elem.text or '')
+        elif elem.tag == _W_BR:
+            # Only line breaks are text; page and column breaks give ''
+            if elem.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        else:
+            parts.append(_RUN_CONTENT_TEXT.get(elem.tag, ''))
+    return ''.join(parts)
+
+
+def _fast_table_text(tbl) -> list[list[str]]:
+    """
+    Return the cell text of each row of a <w:tbl> element.
+
+    Walks the <w:tc> elements directly; going through table.rows/row.cells
+    makes python-docx rebuild its cell grid on every access, which takes
+    minutes on large tables. As in row.cells, a cell spanning several grid
+    columns is repeated once per column, and a vertically merged continuation
+    cell repeats the text of the cell above it.
+    """
+    rows = []
+    prev = []  # Previous row's text by grid column
+    for tr in tbl.iterchildren(_W_TR):
+        before = tr.find(_W_TRPR_GRIDBEFORE)
+        skipped = int(before.get(_W_VAL, 0)) if before is not None else 0
+        grid = [''] * skipped
+        for tc in tr.iterchildren(_W_TC):
+            vmerge = tc.find(_W_TCPR_VMERGE)
+            if vmerge is not None and vmerge.get(_W_VAL, 'continue') == 'continue':
+                offset = len(grid)
+                text = prev[offset] if offset < len(prev) else ''
+            else:
+                text = '\n'.join(_paragraph_text(p) for p in tc.iterchildren(_W_P))
+            span = tc.find(_W_TCPR_GRIDSPAN)
+            grid.extend([text] * (int(span.get(_W_VAL, 1)) if span is not None else 1))
+        rows.append(grid[skipped:])
+        prev = grid
+    return rows
+
+
+def _iter_body_blocks(docx_path: str):
+    """
+    Yield the top-level <w:p>, <w:tbl> and <w:sectPr> elements of the document body.
+
+    word/document.xml is streamed with iterparse and each block is cleared
+    once the caller is done with it, so memory stays flat on large files.
+    Falls back to python-docx if the package uses a nonstandard layout.
+    """
+    tags = (_W_P, _W_TBL, _W_SECTPR)
+    with zipfile.ZipFile(_mmap_open(docx_path)) as zf:
+        if 'word/document.xml' not in zf.namelist():
+            body = Document(_mmap_open(docx_path)).element.body
+            yield from body.iterchildren(*tags)
+            return
+
+        with zf.open('word/document.xml') as xml:
+            for _, elem in etree.iterparse(xml, events=('end',), tag=tags):
+                parent = elem.getparent()
+                if parent is None or parent.tag != _W_BODY:
+                    continue  # Nested elements are read with their table or paragraph
+                yield elem
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+def _read_blocks(blocks) -> tuple[list[str], list[list[list[str]]]]:
+    """Split body blocks into paragraph texts and tables (rows of cell text)."""
+    paragraphs = []
+    tables = []
+
+    for block in blocks:
+        if block.tag == _W_TBL:
+            tables.append(_fast_table_text(block))
+        elif block.tag == _W_P:
+            paragraphs.append(_paragraph_text(block))
+
+    return paragraphs, tables
+
+
+def _join_text(paragraphs: list[str], tables: list[list[list[str]]]) -> str:
+    """Join paragraphs, then table rows as tab-separated lines."""
+    table_lines = ['\t'.join(row) for table in tables for row in table]
+    return '\n'.join(paragraphs + table_lines)
+
+
+def _document_info(core_props, paragraphs: int, tables: int, sections: int) -> dict:
+    """Return metadata and structure info from core properties and block counts."""
+    return {
+        'title': core_props.title,
+        'author': core_props.author,
+        'created': str(core_props.created) if core_props.created else None,
+        'modified': str(core_props.modified) if core_props.modified else None,
+        'paragraphs': paragraphs,
+        'tables': tables,
+        'sections': sections,
+    }
+
+
 def extract_text(docx_path: str) -> str:
     """Extract all text from a Word document."""
-    doc = Document(docx_path)
-    text_parts = []
+    return _join_text(*_read_blocks(_iter_body_blocks(docx_path)))
 
-    for para in doc.paragraphs:
-        text_parts.append(para.text)
 
-    for table in doc.tables:
-        for row in table.rows:
-            row_text = [cell.text for cell in row.cells]
-            text_parts.append('\t'.join(row_text))
+def get_info(docx_path: str) -> dict:
+    """
+    Get document metadata and structure info.
+
+    Reads docProps/core.xml and counts body elements while streaming
+    word/document.xml, instead of building python-docx paragraph and table
+    wrappers just to take their len().
+    """
+    with zipfile.ZipFile(_mmap_open(docx_path)) as zf:
+        names = set(zf.namelist())
+        if not {'docProps/core.xml', 'word/document.xml'} <= names:
+            doc = Document(_mmap_open(docx_path))
+            return _document_info(doc.core_properties, len(doc.paragraphs),
+                                  len(doc.tables), len(doc.sections))
+        # python-docx's own element class parses the dates the same way Document() does
+        core_props = CoreProperties(parse_xml(zf.read('docProps/core.xml')))
+
+    paragraphs = tables = sections = 0
+    for block in _iter_body_blocks(docx_path):
+        if block.tag == _W_TBL:
+            tables += 1
+        elif block.tag == _W_SECTPR:
+            sections += 1
+        else:
+            paragraphs += 1
+            if block.find(_W_PPR_SECTPR) is not None:
+                sections += 1
 
-    return '\n'.join(text_parts)
+    return _document_info(core_props, paragraphs, tables, sections)
 
 
-def get_info(docx_path: str) -> dict:
-    """Get document metadata and structure info."""
-    doc = Document(docx_path)
-    core_props = doc.core_properties
+def digest(docx_path: str) -> dict:
+    """Get info, text, and tables from a single parse of the document."""
+    doc = Document(_mmap_open(docx_path))
+    paragraphs, tables = _read_blocks(doc.element.body.iterchildren(_W_P, _W_TBL))
 
     return {
-        'title': core_props.title,
-        'author': core_props.author,
-        'created': str(core_props.created) if core_props.created else None,
-        'modified': str(core_props.modified) if core_props.modified else None,
-        'paragraphs': len(doc.paragraphs),
-        'tables': len(doc.tables),
-        'sections': len(doc.sections),
+        'info': _document_info(doc.core_properties, len(paragraphs), len(tables), len(doc.sections)),
+        'text': _join_text(paragraphs, tables),
+        'tables': tables,
     }
 
 
+# Markdown line prefixes: '#'-'###' headings, '-'/'*' bullets, '1.' numbered items
+_MD_LINE = re.compile(r'(?:(?P<h>#{1,3})|(?P<b>[-*])|(?P<n>\d+\.)) (?P<rest>.*)', re.ASCII)
+
+
 def from_markdown(md_path: str, docx_path: str):
     """Create a Word document from a markdown file (basic conversion)."""
     doc = Document()
@@ -57,26 +239,21 @@ def from_markdown(md_path: str, docx_path: str):
 
     for line in lines:
         line = line.rstrip('\n')
+        m = _MD_LINE.match(line)
 
+        if m is None:
+            # Empty lines create paragraph breaks; anything else is a regular paragraph
+            if line.strip():
+                doc.add_paragraph(line)
         # Headings
-        if line.startswith('# '):
-            doc.add_heading(line[2:], level=1)
-        elif line.startswith('## '):
-            doc.add_heading(line[3:], level=2)
-        elif line.startswith('### '):
-            doc.add_heading(line[4:], level=3)
+        elif m['h']:
+            doc.add_heading(m['rest'], level=len(m['h']))
         # Bullet lists
-        elif line.startswith('- ') or line.startswith('* '):
-            doc.add_paragraph(line[2:], style='List Bullet')
+        elif m['b']:
+            doc.add_paragraph(m['rest'], style='List Bullet')
         # Numbered lists
-        elif len(line) > 2 and line[0].isdigit() and line[1] == '.':
-            doc.add_paragraph(line[3:], style='List Number')
-        # Empty lines create paragraph breaks
-        elif not line.strip():
-            continue
-        # Regular paragraphs
         else:
-            doc.add_paragraph(line)
+            doc.add_paragraph(m['rest'], style='List Number')
 
     doc.save(docx_path)
     print(f"Created {docx_path}")
@@ -116,6 +293,11 @@ def main():
     p_create.add_argument('output', help='Output Word document')
     p_create.add_argument('--title', help='Document title')
 
+    # digest command
+    p_digest = subparsers.add_parser('digest', help='Extract info, text, and tables as JSON in one pass')
+    p_digest.add_argument('docx', help='Input Word document')
+    p_digest.add_argument('-o', '--output', help='Output JSON file (default: stdout)')
+
     args = parser.parse_args()
 
     if args.command == 'to-text':
@@ -138,6 +320,15 @@ def main():
     elif args.command == 'create':
         create_blank(args.output, args.title)
 
+    elif args.command == 'digest':
+        output = json.dumps(digest(args.docx), indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output)
+            print(f"Written to {args.output}")
+        else:
+            print(output)
+
 
 if __name__ == '__main__':
     main()
@@ -1,106 +1,298 @@
 #!/usr/bin/env python3
 """
-PDF extraction utilities using pdfplumber.
+PDF extraction utilities using pdfplumber (or pdfplumber-rs when installed).
 """
 
 import argparse
 import csv
+import functools
+import json
+import mmap
+import os
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
-    import pdfplumber
+    # pdfplumber-rs is a native drop-in for the pdfplumber API used here.
+    import pdfplumber_rs as pdfplumber
 except ImportError:
-    print("Error: pdfplumber not installed. Run: pip install pdfplumber", file=sys.stderr)
-    sys.exit(1)
+    try:
+        import pdfplumber
+    except ImportError:
+        print("Error: pdfplumber not installed. Run: pip install pdfplumber", file=sys.stderr)
+        sys.exit(1)
 
+NATIVE_BACKEND = pdfplumber.__name__ == 'pdfplumber_rs'
 
-def parse_page_range(page_spec: str, total_pages: int) -> list[int]:
-    """Parse page specification like '1-5,7,9-11' into list of page indices (0-based)."""
+try:
+    import ahocorasick  # pyahocorasick: one scan per page for multi-query search
+except ImportError:
+    ahocorasick = None
+
+
+class _MappedFile(mmap.mmap):
+    """Read-only mmap that also answers seekable() like a file object."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+def _mmap_open(path: str):
+    """Map a file read-only so the parser reads it from the page cache without copying."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return path  # Empty files can't be mapped; let the parser report the error
+        return _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _merge_intervals(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge overlapping/adjacent [start, end) intervals into sorted, disjoint ones."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def parse_page_range(page_spec: str, total_pages: int) -> Iterator[int]:
+    """Parse page specification like '1-5,7,9-11' into sorted page indices (0-based)."""
     if not page_spec:
-        return list(range(total_pages))
+        yield from range(total_pages)
+        return
 
-    pages = set()
+    intervals = []
     for part in page_spec.split(','):
         part = part.strip()
         if '-' in part:
             start, end = part.split('-', 1)
-            start = int(start) - 1  # Convert to 0-based
-            end = int(end)  # End is inclusive in spec
-            pages.update(range(start, min(end, total_pages)))
+            start = max(int(start) - 1, 0)  # Convert to 0-based
+            end = min(int(end), total_pages)  # End is inclusive in spec
         else:
-            page = int(part) - 1
-            if 0 <= page < total_pages:
-                pages.add(page)
+            start = int(part) - 1
+            end = start + 1
+            if not 0 <= start < total_pages:
+                continue
+        if start < end:
+            intervals.append((start, end))
 
-    return sorted(pages)
+    # Each page is yielded once, in order
+    for start, end in _merge_intervals(intervals):
+        yield from range(start, end)
 
 
-def extract_text(pdf_path: str, page_range: str = None) -> str:
-    """Extract text from PDF."""
-    text_parts = []
+# Below this many pages, process startup costs more than the layout work saved.
+PARALLEL_PAGE_THRESHOLD = 50
+
+
+def _extract_from_pages(pdf, indices: list[int], mode: str) -> list[tuple]:
+    """Extract text, tables, or both ('digest') for the given pages of an open PDF."""
+    if mode == 'tables':
+        return [(i, pdf.pages[i].extract_tables()) for i in indices]
+    if mode == 'digest':
+        # Both extractors share the page's parsed layout objects
+        return [(i, (pdf.pages[i].extract_text(), pdf.pages[i].extract_tables())) for i in indices]
+    return [(i, pdf.pages[i].extract_text()) for i in indices]
+
+
+def _extract_pages_worker(pdf_path: str, indices: list[int], mode: str) -> list[tuple]:
+    """Extract a batch of pages (runs in a worker process)."""
+    with pdfplumber.open(_mmap_open(pdf_path)) as pdf:
+        return _extract_from_pages(pdf, indices, mode)
+
+
+def _available_cpus() -> int:
+    """Return the CPUs this process may run on, honouring affinity and cgroup cpusets."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _extract_pages(pdf, pdf_path: str, indices: list[int], mode: str) -> list[tuple]:
+    """Extract pages in order, fanning out to a process pool for large documents."""
+    workers = _available_cpus()
+    if len(indices) < PARALLEL_PAGE_THRESHOLD or workers < 2:
+        return _extract_from_pages(pdf, indices, mode)
+
+    batch_size = max(1, len(indices) // (4 * workers))
+    batches = [indices[i:i + batch_size] for i in range(0, len(indices), batch_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_extract_pages_worker, pdf_path, batch, mode) for batch in batches]
+        for future in futures:
+            results.extend(future.result())
+
+    results.sort(key=lambda item: item[0])
+    return results
+
+
+@functools.lru_cache(maxsize=8)
+def _extract_all_pages(pdf_path: str, mtime_ns: int) -> tuple[str, ...]:
+    """Return the text of every page; mtime_ns keys the cache so edits invalidate it."""
+    with pdfplumber.open(_mmap_open(pdf_path)) as pdf:
+        pages = _extract_pages(pdf, pdf_path, list(range(len(pdf.pages))), 'text')
+
+    return tuple(text or "" for _, text in pages)
+
 
-    with pdfplumber.open(pdf_path) as pdf:
-        pages_to_process = parse_page_range(page_range, len(pdf.pages))
+@functools.lru_cache(maxsize=8)
+def _extract_all_pages_lower(pdf_path: str, mtime_ns: int) -> tuple[str, ...]:
+    """Return the lowercased text of every page, for case-insensitive search."""
+    return tuple(text.lower() for text in _extract_all_pages(pdf_path, mtime_ns))
 
-        for page_idx in pages_to_process:
-            page = pdf.pages[page_idx]
-            text = page.extract_text()
-            if text:
-                text_parts.append(f"--- Page {page_idx + 1} ---")
-                text_parts.append(text)
+
+def _match_context(text: str, idx: int, length: int) -> str:
+    """Return the text around a match at idx, with 50 characters either side."""
+    start = max(0, idx - 50)
+    end = min(len(text), idx + length + 50)
+    return f"...{text[start:end]}..."
+
+
+def _check_table_cells(tables: list) -> None:
+    """Warn if the native backend returns cells that pdfplumber would give as str/None."""
+    for table in tables:
+        for row in table:
+            for cell in row:
+                if cell is not None and not isinstance(cell, str):
+                    version = getattr(pdfplumber, '__version__', 'unknown')
+                    print(f"Warning: pdfplumber_rs {version} returned {type(cell).__name__} "
+                          "table cells; expected str or None", file=sys.stderr)
+                    return
+
+
+def _join_page_text(pages) -> str:
+    """Join (page_idx, text) pairs into text with per-page headers."""
+    text_parts = []
+    for page_idx, text in pages:
+        if text:
+            text_parts.append(f"--- Page {page_idx + 1} ---")
+            text_parts.append(text)
 
     return '\n\n'.join(text_parts)
 
 
+def _collect_tables(pages) -> list[dict]:
+    """Flatten (page_idx, tables) pairs into a list of {'page', 'data'} dicts."""
+    all_tables = []
+    for page_idx, tables in pages:
+        for table in tables:
+            all_tables.append({
+                'page': page_idx + 1,
+                'data': table
+            })
+
+    if NATIVE_BACKEND:
+        _check_table_cells([table_info['data'] for table_info in all_tables])
+
+    return all_tables
+
+
+def _pdf_info(pdf_path: str, pdf) -> dict:
+    """Return metadata and structure info for an open PDF."""
+    return {
+        'path': pdf_path,
+        'pages': len(pdf.pages),
+        'metadata': pdf.metadata,
+    }
+
+
+def extract_text(pdf_path: str, page_range: str = None) -> str:
+    """Extract text from PDF."""
+    with pdfplumber.open(_mmap_open(pdf_path)) as pdf:
+        pages_to_process = list(parse_page_range(page_range, len(pdf.pages)))
+        return _join_page_text(_extract_pages(pdf, pdf_path, pages_to_process, 'text'))
+
+
 def get_info(pdf_path: str) -> dict:
     """Get PDF metadata and structure info."""
-    with pdfplumber.open(pdf_path) as pdf:
-        return {
-            'path': pdf_path,
-            'pages': len(pdf.pages),
-            'metadata': pdf.metadata,
-        }
+    with pdfplumber.open(_mmap_open(pdf_path)) as pdf:
+        return _pdf_info(pdf_path, pdf)
 
 
 def extract_tables(pdf_path: str, page_range: str = None) -> list[list[list]]:
     """Extract all tables from PDF."""
-    all_tables = []
+    with pdfplumber.open(_mmap_open(pdf_path)) as pdf:
+        pages_to_process = list(parse_page_range(page_range, len(pdf.pages)))
+        return _collect_tables(_extract_pages(pdf, pdf_path, pages_to_process, 'tables'))
 
-    with pdfplumber.open(pdf_path) as pdf:
-        pages_to_process = parse_page_range(page_range, len(pdf.pages))
 
-        for page_idx in pages_to_process:
-            page = pdf.pages[page_idx]
-            tables = page.extract_tables()
-            for table in tables:
-                all_tables.append({
-                    'page': page_idx + 1,
-                    'data': table
-                })
+def digest(pdf_path: str, page_range: str = None) -> dict:
+    """Get info, text, and tables in one pass, laying out each page only once."""
+    with pdfplumber.open(_mmap_open(pdf_path)) as pdf:
+        info = _pdf_info(pdf_path, pdf)
+        pages_to_process = list(parse_page_range(page_range, len(pdf.pages)))
+        pages = _extract_pages(pdf, pdf_path, pages_to_process, 'digest')
 
-    return all_tables
+    return {
+        'info': info,
+        'text': _join_page_text((i, text) for i, (text, _) in pages),
+        'tables': _collect_tables((i, tables) for i, (_, tables) in pages),
+    }
 
 
 def search_pdf(pdf_path: str, query: str) -> list[dict]:
     """Search for text in PDF, return matching pages."""
     results = []
     query_lower = query.lower()
+    mtime_ns = os.stat(pdf_path).st_mtime_ns
+    pages = _extract_all_pages(pdf_path, mtime_ns)
+    pages_lower = _extract_all_pages_lower(pdf_path, mtime_ns)
+
+    for i, (text, text_lower) in enumerate(zip(pages, pages_lower)):
+        idx = text_lower.find(query_lower)
+        if idx == -1:
+            continue
+
+        results.append({
+            'page': i + 1,
+            'context': _match_context(text, idx, len(query))
+        })
+
+    return results
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages):
-            text = page.extract_text() or ""
-            if query_lower in text.lower():
-                # Find context around match
-                idx = text.lower().find(query_lower)
-                start = max(0, idx - 50)
-                end = min(len(text), idx + len(query) + 50)
-                context = text[start:end]
-
-                results.append({
-                    'page': i + 1,
-                    'context': f"...{context}..."
-                })
+
+def search_pdf_multi(pdf_path: str, queries: list[str]) -> list[dict]:
+    """Search for several queries at once, return the first match of each query per page."""
+    results = []
+    # Queries that lowercase to the same word share one search; each keeps its own result
+    word_queries = {}
+    for qi, query in enumerate(queries):
+        word_queries.setdefault(query.lower(), []).append(qi)
+    # Like search_pdf, an empty query matches at the start of every page
+    empty_queries = word_queries.pop('', [])
+    mtime_ns = os.stat(pdf_path).st_mtime_ns
+    pages = _extract_all_pages(pdf_path, mtime_ns)
+    pages_lower = _extract_all_pages_lower(pdf_path, mtime_ns)
+
+    automaton = None
+    if ahocorasick is not None and word_queries:
+        automaton = ahocorasick.Automaton()
+        for word, indices in word_queries.items():
+            automaton.add_word(word, (len(word), indices))
+        automaton.make_automaton()
+
+    for i, (text, text_lower) in enumerate(zip(pages, pages_lower)):
+        first_match = dict.fromkeys(empty_queries, 0)
+        if automaton is not None:
+            for end_idx, (length, indices) in automaton.iter(text_lower):
+                for qi in indices:
+                    first_match.setdefault(qi, end_idx - length + 1)
+        else:
+            for word, indices in word_queries.items():
+                idx = text_lower.find(word)
+                if idx != -1:
+                    first_match.update(dict.fromkeys(indices, idx))
+
+        for qi in sorted(first_match):
+            results.append({
+                'page': i + 1,
+                'query': queries[qi],
+                'context': _match_context(text, first_match[qi], len(queries[qi]))
+            })
 
     return results
 
@@ -128,7 +320,13 @@ def main():
     # search command
     p_search = subparsers.add_parser('search', help='Search text in PDF')
     p_search.add_argument('pdf', help='Input PDF file')
-    p_search.add_argument('query', help='Search query')
+    p_search.add_argument('query', nargs='+', help='Search query (several queries are matched in one pass)')
+
+    # digest command
+    p_digest = subparsers.add_parser('digest', help='Extract info, text, and tables as JSON in one pass')
+    p_digest.add_argument('pdf', help='Input PDF file')
+    p_digest.add_argument('-o', '--output', help='Output JSON file (default: stdout)')
+    p_digest.add_argument('--pages', help='Page range')
 
     args = parser.parse_args()
 
@@ -171,13 +369,32 @@ def main():
                     print('\t'.join(str(cell) if cell else '' for cell in row))
 
     elif args.command == 'search':
-        results = search_pdf(args.pdf, args.query)
-        if not results:
-            print(f"No matches found for '{args.query}'")
+        if len(args.query) == 1:
+            query = args.query[0]
+            results = search_pdf(args.pdf, query)
+            if not results:
+                print(f"No matches found for '{query}'")
+            else:
+                print(f"Found {len(results)} page(s) with matches:")
+                for result in results:
+                    print(f"\nPage {result['page']}: {result['context']}")
+        else:
+            results = search_pdf_multi(args.pdf, args.query)
+            if not results:
+                print(f"No matches found for {', '.join(repr(q) for q in args.query)}")
+            else:
+                print(f"Found {len(results)} match(es):")
+                for result in results:
+                    print(f"\nPage {result['page']} [{result['query']}]: {result['context']}")
+
+    elif args.command == 'digest':
+        output = json.dumps(digest(args.pdf, args.pages), indent=2, default=str)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output)
+            print(f"Written to {args.output}")
         else:
-            print(f"Found {len(results)} page(s) with matches:")
-            for result in results:
-                print(f"\nPage {result['page']}: {result['context']}")
+            print(output)
 
 
 if __name__ == '__main__':
@@ -4,53 +4,89 @@ PowerPoint utilities using python-pptx.
 """
 
 import argparse
+import json
+import mmap
+import os
+import re
 import sys
 from pathlib import Path
 
 try:
     from pptx import Presentation
+    from pptx.oxml.ns import nsmap
     from pptx.util import Inches, Pt
+    from lxml import etree
 except ImportError:
     print("Error: python-pptx not installed. Run: pip install python-pptx", file=sys.stderr)
     sys.exit(1)
 
 
+class _MappedFile(mmap.mmap):
+    """Read-only mmap that also answers zipfile's seekable() probe."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+def _mmap_open(path: str):
+    """Map a file read-only so the parser reads it from the page cache without copying."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return path  # Empty files can't be mapped; let the parser report the error
+        return _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _slide_text(numbered_slide) -> str:
+    """Return the text of one (slide_num, slide) pair, including speaker notes."""
+    slide_num, slide = numbered_slide
+    slide_text = [f"--- Slide {slide_num} ---"]
+
+    for shape in slide.shapes:
+        if hasattr(shape, "text") and shape.text.strip():
+            slide_text.append(shape.text)
+
+    # Include speaker notes
+    if slide.has_notes_slide:
+        notes = slide.notes_slide.notes_text_frame.text
+        if notes.strip():
+            slide_text.append(f"[Notes: {notes}]")
+
+    return '\n'.join(slide_text)
+
+
+def _presentation_text(prs) -> str:
+    """Return the text of every slide in an open presentation."""
+    return '\n\n'.join(map(_slide_text, enumerate(prs.slides, 1)))
+
+
 def extract_text(pptx_path: str) -> str:
     """Extract all text from a PowerPoint presentation."""
-    prs = Presentation(pptx_path)
-    text_parts = []
+    return _presentation_text(Presentation(_mmap_open(pptx_path)))
 
-    for slide_num, slide in enumerate(prs.slides, 1):
-        slide_text = [f"--- Slide {slide_num} ---"]
-
-        for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text.strip():
-                slide_text.append(shape.text)
 
-        # Include speaker notes
-        if slide.has_notes_slide:
-            notes = slide.notes_slide.notes_text_frame.text
-            if notes.strip():
-                slide_text.append(f"[Notes: {notes}]")
+# First paragraph of the first top-level shape with visible text, for slides
+# without a usable title placeholder
+_FIRST_TEXT_XPATH = etree.XPath(
+    '(./p:cSld/p:spTree/p:sp/p:txBody[normalize-space(.)])[1]/a:p[1]//a:t/text()',
+    namespaces=nsmap('p', 'a'),
+)
 
-        text_parts.append('\n'.join(slide_text))
 
-    return '\n\n'.join(text_parts)
+def _slide_title(slide) -> str:
+    """Return the first line of the slide's title, truncated to 50 characters."""
+    title_shape = slide.shapes.title
+    if title_shape is not None and title_shape.text_frame.text.strip():
+        return title_shape.text_frame.text.split('\n')[0][:50]
+    return ''.join(_FIRST_TEXT_XPATH(slide._element))[:50]
 
 
-def get_info(pptx_path: str) -> dict:
-    """Get presentation metadata and structure info."""
-    prs = Presentation(pptx_path)
+def _presentation_info(prs) -> dict:
+    """Return metadata and structure info for an open presentation."""
     core_props = prs.core_properties
 
     slide_info = []
     for i, slide in enumerate(prs.slides, 1):
-        title = ""
-        for shape in slide.shapes:
-            if shape.has_text_frame and shape.text.strip():
-                title = shape.text.split('\n')[0][:50]
-                break
-        slide_info.append({'number': i, 'title': title})
+        slide_info.append({'number': i, 'title': _slide_title(slide)})
 
     return {
         'title': core_props.title,
@@ -62,6 +98,35 @@ def get_info(pptx_path: str) -> dict:
     }
 
 
+def get_info(pptx_path: str) -> dict:
+    """Get presentation metadata and structure info."""
+    return _presentation_info(Presentation(_mmap_open(pptx_path)))
+
+
+def digest(pptx_path: str) -> dict:
+    """Get info, text, and tables from a single load of the presentation."""
+    prs = Presentation(_mmap_open(pptx_path))
+
+    tables = []
+    for slide_num, slide in enumerate(prs.slides, 1):
+        for shape in slide.shapes:
+            if shape.has_table:
+                tables.append({
+                    'slide': slide_num,
+                    'data': [[cell.text for cell in row.cells] for row in shape.table.rows],
+                })
+
+    return {
+        'info': _presentation_info(prs),
+        'text': _presentation_text(prs),
+        'tables': tables,
+    }
+
+
+# Outline line prefixes: '#' title, '##' slide, '-'/'*' bullet
+_OUTLINE_LINE = re.compile(r'(?:(?P<h>#{1,2})|(?P<b>[-*])) (?P<rest>.*)', re.ASCII)
+
+
 def from_outline(outline_path: str, pptx_path: str):
     """
     Create a presentation from a markdown outline.
@@ -123,22 +188,24 @@ def from_outline(outline_path: str, pptx_path: str):
     for line in lines:
         stripped = line.strip()
 
-        if stripped.startswith('# '):
+        m = _OUTLINE_LINE.match(stripped)
+
+        if m and m['h'] == '#':
             # Presentation title
             flush_slide()
-            presentation_title = stripped[2:].strip()
+            presentation_title = m['rest'].strip()
             current_slide = presentation_title
 
-        elif stripped.startswith('## '):
+        elif m and m['h'] == '##':
             # New slide
             flush_slide()
-            current_slide = stripped[3:].strip()
+            current_slide = m['rest'].strip()
 
-        elif stripped.startswith('- ') or stripped.startswith('* '):
+        elif m and m['b']:
             # Bullet point - check indentation for level
             indent = len(line) - len(line.lstrip())
             level = min(indent // 2, 4)  # Max 5 levels (0-4)
-            text = stripped[2:].strip()
+            text = m['rest'].strip()
             current_bullets.append((level, text))
 
         elif stripped and current_slide:
@@ -186,6 +253,11 @@ def main():
     p_create.add_argument('output', help='Output PowerPoint file')
     p_create.add_argument('--title', help='Title slide text')
 
+    # digest command
+    p_digest = subparsers.add_parser('digest', help='Extract info, text, and tables as JSON in one pass')
+    p_digest.add_argument('pptx', help='Input PowerPoint file')
+    p_digest.add_argument('-o', '--output', help='Output JSON file (default: stdout)')
+
     args = parser.parse_args()
 
     if args.command == 'extract':
@@ -214,6 +286,15 @@ def main():
     elif args.command == 'create':
         create_blank(args.output, args.title)
 
+    elif args.command == 'digest':
+        output = json.dumps(digest(args.pptx), indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output)
+            print(f"Written to {args.output}")
+        else:
+            print(output)
+
 
 if __name__ == '__main__':
     main()
@@ -5,7 +5,10 @@ Excel file utilities using openpyxl.
 
 import argparse
 import csv
+import functools
 import json
+import mmap
+import os
 import sys
 from pathlib import Path
 
@@ -15,51 +18,232 @@ except ImportError:
     print("Error: openpyxl not installed. Run: pip install openpyxl", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class _MappedFile(mmap.mmap):
+    """Read-only mmap that also answers zipfile's seekable() probe."""
+
+    def seekable(self) -> bool:
+        return True
+
+
+def _mmap_open(path: str):
+    """Map a file read-only so the parser reads it from the page cache without copying."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return path  # Empty files can't be mapped; let the parser report the error
+        return _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_workbook_cached(xlsx_path: str, mtime_ns: int, read_only: bool, data_only: bool):
+    """
+    Load a workbook once per (path, mtime_ns, mode); edits to the file invalidate it.
+
+    Returns (workbook, declared) where declared maps each worksheet title to its
+    <dimension> (max_row, max_column). It is captured before any reader resets
+    the cached worksheets' dimensions, which would otherwise erase it.
+    """
+    wb = load_workbook(_mmap_open(xlsx_path), read_only=read_only, data_only=data_only)
+    declared = {ws.title: (ws.max_row, ws.max_column) for ws in wb.worksheets}
+    return wb, declared
+
+
+def _load_workbook(xlsx_path: str, read_only: bool = True, data_only: bool = False):
+    """Return a cached workbook, reusing the parsed workbook.xml/sharedStrings.xml."""
+    return _load_workbook_with_dimensions(xlsx_path, read_only, data_only)[0]
+
+
+def _load_workbook_with_dimensions(xlsx_path: str, read_only: bool = True, data_only: bool = False):
+    """Return a cached (workbook, declared dimensions by sheet title) pair."""
+    mtime_ns = os.stat(xlsx_path).st_mtime_ns
+    return _load_workbook_cached(xlsx_path, mtime_ns, read_only, data_only)
+
 
 def get_sheet_names(xlsx_path: str) -> list[str]:
     """Return list of sheet names in workbook."""
-    wb = load_workbook(xlsx_path, read_only=True)
+    wb = _load_workbook(xlsx_path)
     return wb.sheetnames
 
 
+def _iter_trimmed_rows(ws):
+    """
+    Yield row values within the sheet's actual data range, without padding.
+
+    Excel often writes an inflated <dimension> tag (e.g. A1:BK1048501), which
+    read-only openpyxl trusts when padding rows. Resetting it makes iteration
+    follow the stored cells; trailing empty cells and rows are dropped.
+    """
+    ws.reset_dimensions()
+    blank_rows = 0
+    for row in ws.iter_rows(values_only=True):
+        end = len(row)
+        while end and row[end - 1] is None:
+            end -= 1
+        if not end:
+            blank_rows += 1
+            continue
+        # Blank rows only count once there is data after them
+        for _ in range(blank_rows):
+            yield ()
+        blank_rows = 0
+        yield row[:end]
+
+
+def _used_extent(ws) -> tuple[int, int]:
+    """Return (rows, cols) of the sheet's actual data range, scanning it once."""
+    rows = cols = 0
+    for row in _iter_trimmed_rows(ws):
+        rows += 1
+        cols = max(cols, len(row))
+    return rows, cols
+
+
+def _iter_used_rows(ws, width: int | None = None):
+    """
+    Yield row values padded to width, the sheet's declared column count, in one pass.
+
+    Inflated <dimension> tags mostly overstate the row count, so only trailing
+    blank rows are dropped; a declared width (at most 16384) is kept as is.
+    Without a declared width the used width is measured in a first pass.
+    """
+    if width is None:
+        _, width = _used_extent(ws)
+    ws.reset_dimensions()
+    blank = (None,) * width
+    blank_rows = 0
+    for row in ws.iter_rows(max_col=width or None, values_only=True):
+        if row.count(None) == len(row):
+            blank_rows += 1
+            continue
+        # Blank rows only count once there is data after them
+        for _ in range(blank_rows):
+            yield blank
+        blank_rows = 0
+        yield row
+
+
+def _load_sheet(xlsx_path: str, sheet_name: str | None = None):
+    """
+    Open a workbook read-only and return the requested (or active) sheet.
+
+    Returns (worksheet, declared column count or None).
+    """
+    wb, declared_dims = _load_workbook_with_dimensions(xlsx_path, data_only=True)
+    ws = wb[sheet_name] if sheet_name else wb.active
+    return ws, declared_dims.get(ws.title, (None, None))[1]
+
+
+def _read_rows(ws) -> list[list]:
+    """Read a sheet's used range as list of lists, padded to the widest row."""
+    rows = [list(row) for row in _iter_trimmed_rows(ws)]
+    width = max((len(row) for row in rows), default=0)
+    for row in rows:
+        row.extend([None] * (width - len(row)))
+    return rows
+
+
 def read_sheet_data(xlsx_path: str, sheet_name: str | None = None) -> list[list]:
     """Read all data from a sheet as list of lists."""
-    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
-    ws = wb[sheet_name] if sheet_name else wb.active
-    return [[cell.value for cell in row] for row in ws.iter_rows()]
+    ws, _ = _load_sheet(xlsx_path, sheet_name)
+    return _read_rows(ws)
+
+
+CSV_BUFFER_SIZE = 1 << 20
 
 
 def to_csv(xlsx_path: str, csv_path: str, sheet_name: str | None = None):
-    """Convert Excel sheet to CSV."""
-    data = read_sheet_data(xlsx_path, sheet_name)
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerows(data)
+    """Convert Excel sheet to CSV, streaming rows straight from the workbook."""
+    ws, width = _load_sheet(xlsx_path, sheet_name)
+    # writerows keeps the per-row loop inside the C csv module; the large
+    # buffer batches the encode/write calls
+    with open(csv_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        csv.writer(f).writerows(_iter_used_rows(ws, width))
     print(f"Written to {csv_path}")
 
 
+def _dump_json(obj) -> bytes:
+    """Serialize obj with 2-space indentation, using orjson when it is installed."""
+    if orjson is not None:
+        # Route dates through default=str so both paths format them the same way.
+        # The output is equivalent JSON, not byte-identical: float spellings can
+        # differ (orjson writes 1e20 where json writes 1e+20)
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(obj, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+
+
 def to_json(xlsx_path: str, json_path: str, sheet_name: str | None = None):
     """Convert Excel sheet to JSON (list of objects using first row as headers)."""
-    data = read_sheet_data(xlsx_path, sheet_name)
-    if not data:
-        result = []
-    else:
-        headers = [str(h) if h else f"col_{i}" for i, h in enumerate(data[0])]
-        result = [dict(zip(headers, row)) for row in data[1:]]
-
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, default=str)
+    # Rows come padded to the sheet's declared width, so the header row already
+    # spans every column and each record gets the same keys
+    ws, width = _load_sheet(xlsx_path, sheet_name)
+    rows = _iter_used_rows(ws, width)
+    header_row = next(rows, ())
+    headers = [str(h) if h else f"col_{i}" for i, h in enumerate(header_row)]
+
+    # Write one array element per row so memory stays flat on large sheets;
+    # the output matches dumping the whole list with indent=2.
+    with open(json_path, 'wb') as f:
+        separator = b'[\n'
+        for row in rows:
+            item = _dump_json(dict(zip(headers, row)))
+            f.write(separator + b'  ' + item.replace(b'\n', b'\n  '))
+            separator = b',\n'
+        f.write(b'[]' if separator == b'[\n' else b'\n]')
     print(f"Written to {json_path}")
 
 
+def _declared_differs(declared: tuple, actual: tuple[int, int]) -> bool:
+    """Whether a sheet's <dimension> disagrees with its actual data range."""
+    if None in declared:
+        return False  # No <dimension> element (e.g. write-only output), nothing to compare
+    if declared == (1, 1) and actual == (0, 0):
+        return False  # An empty sheet declares A1:A1
+    return declared != actual
+
+
 def summarize(xlsx_path: str):
     """Print summary of workbook structure."""
-    wb = load_workbook(xlsx_path, read_only=True)
+    # One read-only workbook, scanned serially: the scan is CPU-bound parsing,
+    # so worker threads only add contention and per-worker workbook loads
+    wb, declared_dims = _load_workbook_with_dimensions(xlsx_path)
     print(f"Workbook: {xlsx_path}")
     print(f"Sheets: {len(wb.sheetnames)}")
     for name in wb.sheetnames:
-        ws = wb[name]
-        print(f"  - {name}: {ws.max_row} rows x {ws.max_column} cols")
+        declared = declared_dims.get(name, (None, None))
+        rows, cols = _used_extent(wb[name])
+        line = f"  - {name}: {rows} rows x {cols} cols"
+        if _declared_differs(declared, (rows, cols)):
+            line += f" (declared {declared[0]} rows x {declared[1]} cols)"
+        print(line)
+
+
+def digest(xlsx_path: str) -> dict:
+    """Get workbook info and every sheet's data from a single load."""
+    wb, declared_dims = _load_workbook_with_dimensions(xlsx_path, data_only=True)
+    sheets = []
+    tables = {}
+
+    for ws in wb.worksheets:
+        declared = declared_dims[ws.title]
+        rows = _read_rows(ws)
+        sheets.append({
+            'name': ws.title,
+            'rows': len(rows),
+            'cols': len(rows[0]) if rows else 0,
+            'declared_rows': declared[0],
+            'declared_cols': declared[1],
+        })
+        tables[ws.title] = rows
+
+    return {
+        'info': {'path': xlsx_path, 'sheets': sheets},
+        'tables': tables,
+    }
 
 
 def main():
@@ -86,6 +270,11 @@ def main():
     p_sum = subparsers.add_parser('summarize', help='Summarize workbook')
     p_sum.add_argument('xlsx', help='Input Excel file')
 
+    # digest command
+    p_digest = subparsers.add_parser('digest', help='Dump info and all sheet data as JSON in one pass')
+    p_digest.add_argument('xlsx', help='Input Excel file')
+    p_digest.add_argument('-o', '--output', help='Output JSON file (default: stdout)')
+
     args = parser.parse_args()
 
     if args.command == 'sheets':
@@ -97,6 +286,14 @@ def main():
         to_json(args.xlsx, args.output, getattr(args, 'sheet', None))
     elif args.command == 'summarize':
         summarize(args.xlsx)
+    elif args.command == 'digest':
+        output = json.dumps(digest(args.xlsx), indent=2, default=str)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output)
+            print(f"Written to {args.output}")
+        else:
+            print(output)
 
 
 if __name__ == '__main__':